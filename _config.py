@@ -0,0 +1,35 @@
+"""
+Configuration - environment settings read once at import.
+"""
+
+import os
+
+
+API_KEY = os.getenv("GOOGLE_API_KEY")
+
+# Upper bound on concurrent Gemini requests, so fan-out keeps the API busy without throttling
+MAX_INFLIGHT = int(os.getenv("GENAI_MAX_INFLIGHT", 20))
+
+# Durable cache of complete workflow results (see results_cache.py); it stores
+# resume-derived data, so RootAgent only uses it when a path is configured
+RESULTS_CACHE_PATH = os.getenv("RESULTS_CACHE_PATH")
+RESULTS_CACHE_TTL = int(os.getenv("RESULTS_CACHE_TTL", 7 * 24 * 3600))
+
+
+def require_api_key(api_key: str = None) -> str:
+    """
+    Resolve the Google API key, falling back to GOOGLE_API_KEY from the environment.
+    
+    Args:
+        api_key: Explicit API key (takes precedence)
+        
+    Returns:
+        The API key
+        
+    Raises:
+        ValueError: If no API key is available
+    """
+    api_key = api_key or API_KEY
+    if not api_key:
+        raise ValueError("Google API key is required. Set GOOGLE_API_KEY environment variable.")
+    return api_key
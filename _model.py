@@ -0,0 +1,180 @@
+"""
+Shared Gemini model - configures the SDK once and reuses one GenerativeModel
+(and its underlying client connections) across all agents.
+"""
+
+import asyncio
+import threading
+import weakref
+
+from google import generativeai as genai
+from google.api_core.exceptions import InternalServerError, ResourceExhausted, ServiceUnavailable
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+
+from . import llm_cache
+from ._config import MAX_INFLIGHT
+from ._utils import parse_json
+
+
+# Using gemini-2.0-flash for better performance and speed
+MODEL_NAME = "gemini-2.0-flash-exp"
+
+# 429 (model overloaded / quota) and 5xx responses are worth retrying
+TRANSIENT_ERRORS = (ResourceExhausted, ServiceUnavailable, InternalServerError)
+
+# asyncio primitives are tied to one event loop, so keep one semaphore per loop
+_semaphores = weakref.WeakKeyDictionary()
+
+# Long-lived loop for sync callers (see run_sync)
+_sync_loop = None
+_sync_loop_lock = threading.Lock()
+
+# genai.configure() is process-global, so the process shares one model and one key
+_model = None
+_model_api_key = None
+_model_lock = threading.Lock()
+
+
+def get_model(api_key: str) -> genai.GenerativeModel:
+    """
+    Return the process-wide GenerativeModel, configuring the SDK on first use.
+    
+    Args:
+        api_key: Google API key
+        
+    Returns:
+        Configured GenerativeModel instance
+        
+    Raises:
+        ValueError: If a different API key was already configured in this process
+    """
+    global _model, _model_api_key
+    with _model_lock:
+        if _model is None:
+            genai.configure(api_key=api_key)
+            _model = genai.GenerativeModel(MODEL_NAME)
+            _model_api_key = api_key
+        elif api_key != _model_api_key:
+            raise ValueError("The Gemini SDK is configured for one API key per process; "
+                             "a different key was already used.")
+        return _model
+
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion on the shared background event loop.
+    
+    The SDK caches its async (grpc.aio) client on the first event loop that uses
+    it, so sync entry points must reuse one long-lived loop rather than
+    asyncio.run(), which creates and closes a new loop on every call.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+        
+    Raises:
+        RuntimeError: If called from a running event loop (await the async API instead)
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coro.close()
+        raise RuntimeError("Cannot block inside a running event loop; await the async API instead.")
+    
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="genai-sync-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _sync_loop).result()
+
+
+def inflight_semaphore() -> asyncio.Semaphore:
+    """Return the request-limiting (GENAI_MAX_INFLIGHT) semaphore for the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(MAX_INFLIGHT)
+    return semaphore
+
+
+@retry(stop=stop_after_attempt(4),
+       wait=wait_exponential_jitter(initial=0.5, max=8),
+       retry=retry_if_exception_type(TRANSIENT_ERRORS),
+       reraise=True)
+async def call_with_retry(model: genai.GenerativeModel, prompt: str, **kwargs):
+    """
+    Call generate_content_async, retrying transient errors with exponential backoff and jitter.
+    
+    At most MAX_INFLIGHT calls run at once; backoff sleeps do not hold a slot.
+    With stream=True the call does not take a slot itself: the caller must hold
+    inflight_semaphore() until the stream is consumed, since generation
+    continues while the body is read (see stream_json_fields).
+    
+    Args:
+        model: GenerativeModel to call
+        prompt: The prompt to send
+        **kwargs: Extra generate_content_async arguments (e.g. stream=True)
+        
+    Returns:
+        The model response
+        
+    Raises:
+        google.api_core.exceptions.GoogleAPIError: On non-retryable errors, or
+            once retries are exhausted
+    """
+    if kwargs.get("stream"):
+        return await model.generate_content_async(prompt, **kwargs)
+    async with inflight_semaphore():
+        return await model.generate_content_async(prompt, **kwargs)
+
+
+def json_generation_config(response_schema=None) -> dict:
+    """
+    Build a generation config that makes Gemini emit bare JSON (no markdown fences).
+    
+    Args:
+        response_schema: Optional schema type (e.g. a TypedDict) the JSON must follow
+        
+    Returns:
+        generation_config dictionary
+    """
+    config = {"response_mime_type": "application/json"}
+    if response_schema is not None:
+        config["response_schema"] = response_schema
+    return config
+
+
+async def generate_json(model: genai.GenerativeModel, prompt: str, response_schema=None,
+                        free_text: str = ""):
+    """
+    Return the parsed JSON response for a prompt, served from the LLM cache when possible.
+    
+    Cache lookups may embed text, so they run in a worker thread; only responses
+    that parse are stored.
+    
+    Args:
+        model: GenerativeModel to call on a cache miss
+        prompt: The prompt to send
+        response_schema: Optional schema type the response must follow
+        free_text: Free-text part of the prompt (e.g. the resume) that the cache
+            may match by similarity; the rest of the prompt must match exactly
+        
+    Returns:
+        Parsed JSON response
+        
+    Raises:
+        json.JSONDecodeError: If the response is not valid JSON
+    """
+    cached, vector = await asyncio.to_thread(llm_cache.lookup, prompt, free_text, response_schema)
+    if cached is not None:
+        return parse_json(cached)
+    response = await call_with_retry(model, prompt,
+                                     generation_config=json_generation_config(response_schema))
+    result = parse_json(response.text)
+    await asyncio.to_thread(llm_cache.store, prompt, response.text, free_text, response_schema, vector)
+    return result
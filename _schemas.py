@@ -0,0 +1,155 @@
+"""
+Response schemas - structured-output schemas and default field values for each
+agent's response.
+"""
+
+from types import MappingProxyType
+from typing import TypedDict
+
+
+RESUME_DEFAULTS = MappingProxyType({
+    "technical_skills": [],
+    "soft_skills": [],
+    "experience_summary": "Not specified",
+    "resume_strength": 0.0,
+    "years_of_experience": 0
+})
+
+CAREER_DEFAULTS = MappingProxyType({
+    "best_fit_role": {
+        "title": "Not specified",
+        "match_score": 0.0,
+        "reasoning": "Unable to determine"
+    },
+    "alternative_roles": [],
+    "career_insights": "No additional insights available"
+})
+
+SKILL_GAP_DEFAULTS = MappingProxyType({
+    "missing_skills": [],
+    "gap_analysis": "No gaps identified",
+    "readiness_score": 0.0
+})
+
+ROADMAP_DEFAULTS = MappingProxyType({
+    "roadmap_duration": 6,
+    "target_role": "Not specified",
+    "monthly_goals": [],
+    "overall_strategy": "No strategy provided",
+    "success_metrics": []
+})
+
+INTERVIEW_DEFAULTS = MappingProxyType({
+    "target_role": "Not specified",
+    "technical_questions": [],
+    "behavioral_questions": [],
+    "preparation_tips": [],
+    "common_red_flags": [],
+    "success_strategies": []
+})
+
+
+def merge_defaults(result: dict, defaults, **overrides) -> dict:
+    """
+    Return a new dict with any fields missing from result filled from defaults.
+    
+    Mutable default values (lists/dicts, which are flat here) that end up in
+    the result are shallow-copied, so the merged dict can be mutated freely.
+    
+    Args:
+        result: Parsed response (its values always win)
+        defaults: One of the *_DEFAULTS mappings
+        **overrides: Per-call default values (e.g. the requested target_role)
+        
+    Returns:
+        Merged response dictionary
+        
+    Raises:
+        ValueError: If result is not a JSON object
+    """
+    if not isinstance(result, dict):
+        raise ValueError(f"Expected a JSON object, got {type(result).__name__}")
+    merged = {**defaults, **overrides, **result}
+    for key, value in merged.items():
+        if key not in result and isinstance(value, (list, dict)):
+            merged[key] = value.copy()
+    return merged
+
+
+# Response schemas passed to Gemini's JSON mode (response_schema)
+
+class ResumeAnalysis(TypedDict):
+    technical_skills: list[str]
+    soft_skills: list[str]
+    experience_summary: str
+    resume_strength: float
+    years_of_experience: int
+
+
+class RoleRecommendation(TypedDict):
+    title: str
+    match_score: float
+    reasoning: str
+
+
+class CareerRecommendations(TypedDict):
+    best_fit_role: RoleRecommendation
+    alternative_roles: list[RoleRecommendation]
+    career_insights: str
+
+
+class ResumeCareerAnalysis(TypedDict):
+    resume_analysis: ResumeAnalysis
+    career_recommendations: CareerRecommendations
+
+
+class MissingSkill(TypedDict):
+    skill: str
+    priority: str
+    reason: str
+
+
+class SkillGapAnalysis(TypedDict):
+    missing_skills: list[MissingSkill]
+    gap_analysis: str
+    readiness_score: float
+
+
+class CompactMonthlyGoal(TypedDict):
+    """Monthly goal with the compact keys RoadmapAgent asks for (see roadmap_agent._MONTH_KEYS)."""
+    m: int
+    f: list[str]
+    o: list[str]
+    s: list[str]
+    p: list[str]
+    r: list[str]
+
+
+class LearningRoadmap(TypedDict):
+    roadmap_duration: int
+    target_role: str
+    monthly_goals: list[CompactMonthlyGoal]
+    overall_strategy: str
+    success_metrics: list[str]
+
+
+class TechnicalQuestion(TypedDict):
+    question: str
+    category: str
+    difficulty: str
+    tips: str
+
+
+class BehavioralQuestion(TypedDict):
+    question: str
+    focus_area: str
+    tips: str
+
+
+class InterviewPreparation(TypedDict):
+    target_role: str
+    technical_questions: list[TechnicalQuestion]
+    behavioral_questions: list[BehavioralQuestion]
+    preparation_tips: list[str]
+    common_red_flags: list[str]
+    success_strategies: list[str]
@@ -0,0 +1,82 @@
+"""
+Streaming helpers - surface array items from a Gemini JSON response while it
+is still being generated, instead of waiting for the full response.
+"""
+
+import asyncio
+
+import ijson
+
+from . import llm_cache
+from ._model import call_with_retry, inflight_semaphore, json_generation_config
+from ._utils import parse_json
+
+
+def _field_name(path: str) -> str:
+    """Map an ijson prefix like "technical_skills.item" to its field name."""
+    return path[:-len(".item")] if path.endswith(".item") else path
+
+
+def _lookup(result, path: str) -> list:
+    """Collect the values an ijson prefix would yield from an already-parsed result."""
+    values = [result]
+    for key in path.split("."):
+        found = []
+        for value in values:
+            if key == "item" and isinstance(value, list):
+                found.extend(value)
+            elif isinstance(value, dict) and key in value:
+                found.append(value[key])
+        values = found
+    return values
+
+
+async def stream_json_fields(model, prompt: str, paths: list, response_schema=None, free_text: str = ""):
+    """
+    Stream a model response and yield JSON values as soon as they are complete.
+    
+    Args:
+        model: GenerativeModel used to generate the response
+        prompt: The prompt to send
+        paths: ijson prefixes to watch (e.g. "technical_skills.item")
+        response_schema: Optional schema type the response must follow
+        free_text: Free-text part of the prompt the LLM cache may match by similarity
+        
+    Yields:
+        {"field": name, "item": value} for each completed value under a watched
+        prefix, then {"result": parsed} with the complete parsed response
+    """
+    cached, vector = await asyncio.to_thread(llm_cache.lookup, prompt, free_text, response_schema)
+    if cached is not None:
+        result = parse_json(cached)
+        for path in paths:
+            for item in _lookup(result, path):
+                yield {"field": _field_name(path), "item": item}
+        yield {"result": result}
+        return
+    
+    sinks = {path: ijson.sendable_list() for path in paths}
+    parsers = {path: ijson.items_coro(sinks[path], path, use_float=True) for path in paths}
+    chunks = []
+    
+    # Hold a GENAI_MAX_INFLIGHT slot for the whole generation, not just the first chunk
+    async with inflight_semaphore():
+        response = await call_with_retry(model, prompt, stream=True,
+                                         generation_config=json_generation_config(response_schema))
+        async for chunk in response:
+            chunks.append(chunk.text)
+            data = chunk.text.encode()
+            for path in list(parsers):
+                try:
+                    parsers[path].send(data)
+                except ijson.JSONError:
+                    # Malformed output; stop watching this path and let the final parse report it
+                    del parsers[path]
+                for item in sinks[path]:
+                    yield {"field": _field_name(path), "item": item}
+                del sinks[path][:]
+    
+    response_text = "".join(chunks)
+    result = parse_json(response_text)
+    await asyncio.to_thread(llm_cache.store, prompt, response_text, free_text, response_schema, vector)
+    yield {"result": result}
@@ -0,0 +1,51 @@
+"""
+Shared helpers for parsing Gemini responses across all agents.
+"""
+
+import json
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _loads = json.loads
+
+
+def parse_json(response_text: str):
+    """
+    Parse a JSON-mode model response.
+    
+    Args:
+        response_text: Raw response text from the model
+        
+    Returns:
+        Parsed JSON value
+        
+    Raises:
+        json.JSONDecodeError: If the response is not valid JSON, e.g. truncated
+            output (orjson.JSONDecodeError subclasses it)
+    """
+    return _loads(response_text)
+
+
+def batch_items(items, count: int) -> list:
+    """
+    Map a batched JSON-array response onto its requests by position.
+    
+    Args:
+        items: Parsed response, expected to hold one object per request
+        count: Number of requests in the batch
+        
+    Returns:
+        One dictionary per request; requests the response did not cover get
+        {"error": ...} so callers can tell a placeholder from real output
+        
+    Raises:
+        ValueError: If the response is not a JSON array
+    """
+    if not isinstance(items, list):
+        raise ValueError("Expected a JSON array with one object per request")
+    return [
+        items[i] if i < len(items) and isinstance(items[i], dict) else {"error": "Missing from model response"}
+        for i in range(count)
+    ]
@@ -0,0 +1,59 @@
+"""
+AnalysisResult - Read-only view over RootAgent results with memoized summary fields.
+Dashboards that re-render often can hold one instance instead of re-walking the dicts.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+
+
+@dataclass(frozen=True, eq=False)
+class AnalysisResult:
+    """Wraps a results dictionary from RootAgent.analyze(); each summary field is computed once."""
+    
+    results: dict
+    
+    def _section(self, name: str) -> dict:
+        # Sections are None when the workflow failed before reaching them
+        return self.results.get(name) or {}
+    
+    @cached_property
+    def resume_strength(self) -> float:
+        return self._section("resume_analysis").get("resume_strength", 0.0)
+    
+    @cached_property
+    def recommended_role(self) -> str:
+        best_fit = self._section("career_recommendations").get("best_fit_role", {})
+        return best_fit.get("title", "Not determined")
+    
+    @cached_property
+    def readiness_score(self) -> float:
+        return self._section("skill_gap_analysis").get("readiness_score", 0.0)
+    
+    @cached_property
+    def total_skill_gaps(self) -> int:
+        return len(self._section("skill_gap_analysis").get("missing_skills", []))
+    
+    @cached_property
+    def roadmap_duration(self) -> int:
+        return self._section("learning_roadmap").get("roadmap_duration", 0)
+    
+    @cached_property
+    def interview_questions_generated(self) -> dict:
+        interview = self._section("interview_preparation")
+        return {
+            "technical": len(interview.get("technical_questions", [])),
+            "behavioral": len(interview.get("behavioral_questions", []))
+        }
+    
+    @cached_property
+    def summary(self) -> dict:
+        """High-level summary of the analysis results."""
+        return {
+            "resume_strength": self.resume_strength,
+            "recommended_role": self.recommended_role,
+            "readiness_score": self.readiness_score,
+            "total_skill_gaps": self.total_skill_gaps,
+            "roadmap_duration": self.roadmap_duration,
+            "interview_questions_generated": self.interview_questions_generated
+        }
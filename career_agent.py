@@ -3,64 +3,47 @@ CareerAgent - Recommends best-fit job roles based on user's skills and experienc
 Uses Google ADK for intelligent career path recommendations.
 """
 
-from google import generativeai as genai
+from ._config import require_api_key
+from ._model import generate_json, get_model
+from ._schemas import CAREER_DEFAULTS, CareerRecommendations, merge_defaults
+from ._streaming import stream_json_fields
 import json
-import os
+import string
+
+
+# Recommendations keep at most this many alternative roles
+MAX_ALTERNATIVE_ROLES = 2
 
 
 class CareerAgent:
-    def __init__(self, api_key: str = None):
-        """Initialize CareerAgent with Google ADK."""
-        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
-        if not self.api_key:
-            raise ValueError("Google API key is required. Set GOOGLE_API_KEY environment variable.")
-        
-        genai.configure(api_key=self.api_key)
-        # Using gemini-2.0-flash for better performance and speed
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
-    
-    def recommend_careers(self, technical_skills: list, soft_skills: list, 
-                         experience_summary: str, years_of_experience: int = 0) -> dict:
-        """
-        Recommend career paths based on user's profile.
-        
-        Args:
-            technical_skills: List of technical skills
-            soft_skills: List of soft skills
-            experience_summary: Summary of experience
-            years_of_experience: Years of professional experience
-            
-        Returns:
-            Dictionary with recommended roles and alternatives
-        """
-        prompt = f"""Based on the user's profile, recommend the best-fit job role and alternative roles.
+    _PROMPT_TMPL = string.Template("""Based on the user's profile, recommend the best-fit job role and alternative roles.
 
-Technical Skills: {', '.join(technical_skills)}
-Soft Skills: {', '.join(soft_skills)}
-Experience: {experience_summary}
-Years of Experience: {years_of_experience}
+Technical Skills: $technical_skills
+Soft Skills: $soft_skills
+Experience: $experience_summary
+Years of Experience: $years_of_experience
 
 Return a JSON response with the following structure:
-{{
-    "best_fit_role": {{
+{
+    "best_fit_role": {
         "title": "Job Title",
         "match_score": 9.0,
         "reasoning": "Why this role is the best fit (2-3 sentences)"
-    }},
+    },
     "alternative_roles": [
-        {{
+        {
             "title": "Alternative Job Title 1",
             "match_score": 8.0,
             "reasoning": "Why this is a good alternative (1-2 sentences)"
-        }},
-        {{
+        },
+        {
             "title": "Alternative Job Title 2",
             "match_score": 7.5,
             "reasoning": "Why this is a good alternative (1-2 sentences)"
-        }}
+        }
     ],
     "career_insights": "Additional insights about career progression and opportunities (2-3 sentences)"
-}}
+}
 
 Instructions:
 - Recommend 1 best-fit role based on skills and experience
@@ -69,58 +52,100 @@ Instructions:
 - Give clear reasoning for each recommendation
 - Include career insights
 
-Return ONLY valid JSON, no additional text."""
+Return ONLY valid JSON, no additional text.""")
+    
+    def __init__(self, api_key: str = None):
+        """Initialize CareerAgent with Google ADK."""
+        self.api_key = require_api_key(api_key)
+        
+        self.model = get_model(self.api_key)
+    
+    async def recommend_careers(self, technical_skills: list, soft_skills: list, 
+                         experience_summary: str, years_of_experience: int = 0) -> dict:
+        """
+        Recommend career paths based on user's profile.
+        
+        Args:
+            technical_skills: List of technical skills
+            soft_skills: List of soft skills
+            experience_summary: Summary of experience
+            years_of_experience: Years of professional experience
+            
+        Returns:
+            Dictionary with recommended roles and alternatives
+        """
+        prompt = self._build_prompt(technical_skills, soft_skills, experience_summary, years_of_experience)
 
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
+            response = await generate_json(self.model, prompt, CareerRecommendations,
+                                           free_text=experience_summary)
             
-            # Clean response text
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
+            return self._complete(response)
             
-            result = json.loads(response_text)
-            
-            # Ensure required fields
-            result.setdefault("best_fit_role", {
-                "title": "Not specified",
-                "match_score": 0.0,
-                "reasoning": "Unable to determine"
-            })
-            result.setdefault("alternative_roles", [])
-            result.setdefault("career_insights", "No additional insights available")
-            
-            # Ensure we have 1-2 alternative roles
-            if len(result["alternative_roles"]) > 2:
-                result["alternative_roles"] = result["alternative_roles"][:2]
-            
-            return result
+        except json.JSONDecodeError as e:
+            return self._fallback(e)
+    
+    async def recommend_careers_stream(self, technical_skills: list, soft_skills: list, 
+                                       experience_summary: str, years_of_experience: int = 0):
+        """
+        Stream career recommendations, yielding each role as soon as it is generated.
+        
+        Args:
+            technical_skills: List of technical skills
+            soft_skills: List of soft skills
+            experience_summary: Summary of experience
+            years_of_experience: Years of professional experience
             
+        Yields:
+            {"field": "best_fit_role" | "alternative_roles", "item": role} for each
+            role as it is generated (at most MAX_ALTERNATIVE_ROLES alternatives), then
+            {"result": recommendations} with the full response, completed exactly
+            as recommend_careers() returns it
+        """
+        prompt = self._build_prompt(technical_skills, soft_skills, experience_summary, years_of_experience)
+        alternatives = 0
+        try:
+            async for event in stream_json_fields(self.model, prompt, ["best_fit_role", "alternative_roles.item"],
+                                                 CareerRecommendations, free_text=experience_summary):
+                if "result" in event:
+                    event = {"result": self._complete(event["result"])}
+                elif event["field"] == "alternative_roles":
+                    # Do not show roles that the final result will drop
+                    alternatives += 1
+                    if alternatives > MAX_ALTERNATIVE_ROLES:
+                        continue
+                yield event
         except json.JSONDecodeError as e:
-            return {
-                "best_fit_role": {
-                    "title": "Error",
-                    "match_score": 0.0,
-                    "reasoning": "Error analyzing career options"
-                },
-                "alternative_roles": [],
-                "career_insights": "Unable to generate recommendations",
-                "error": str(e)
-            }
-        except Exception as e:
-            return {
-                "best_fit_role": {
-                    "title": "Error",
-                    "match_score": 0.0,
-                    "reasoning": f"Error: {str(e)}"
-                },
-                "alternative_roles": [],
-                "career_insights": "Unable to generate recommendations",
-                "error": str(e)
-            }
+            yield {"result": self._fallback(e)}
+    
+    @staticmethod
+    def _complete(response) -> dict:
+        """Fill in required fields and keep at most MAX_ALTERNATIVE_ROLES alternative roles."""
+        result = merge_defaults(response, CAREER_DEFAULTS)
+        if len(result["alternative_roles"]) > MAX_ALTERNATIVE_ROLES:
+            result["alternative_roles"] = result["alternative_roles"][:MAX_ALTERNATIVE_ROLES]
+        return result
+    
+    @staticmethod
+    def _fallback(error: Exception) -> dict:
+        """Fallback recommendations when the model response is malformed JSON."""
+        return merge_defaults({
+            "best_fit_role": {
+                "title": "Error",
+                "match_score": 0.0,
+                "reasoning": "Error analyzing career options"
+            },
+            "career_insights": "Unable to generate recommendations",
+            "error": str(error)
+        }, CAREER_DEFAULTS)
+    
+    def _build_prompt(self, technical_skills: list, soft_skills: list, 
+                      experience_summary: str, years_of_experience: int) -> str:
+        """Build the career recommendation prompt."""
+        return self._PROMPT_TMPL.substitute(
+            technical_skills=", ".join(technical_skills),
+            soft_skills=", ".join(soft_skills),
+            experience_summary=experience_summary,
+            years_of_experience=years_of_experience
+        )
 
@@ -3,63 +3,41 @@ InterviewAgent - Generates interview questions and preparation tips.
 Uses Google ADK for intelligent interview question generation.
 """
 
-from google import generativeai as genai
+from ._config import require_api_key
+from ._model import generate_json, get_model
+from ._schemas import INTERVIEW_DEFAULTS, InterviewPreparation, merge_defaults
+from ._streaming import stream_json_fields
+from ._utils import batch_items
 import json
-import os
+import string
 
 
 class InterviewAgent:
-    def __init__(self, api_key: str = None):
-        """Initialize InterviewAgent with Google ADK."""
-        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
-        if not self.api_key:
-            raise ValueError("Google API key is required. Set GOOGLE_API_KEY environment variable.")
-        
-        genai.configure(api_key=self.api_key)
-        # Using gemini-2.0-flash for better performance and speed
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
-    
-    def generate_questions(self, target_role: str, technical_skills: list, 
-                          experience_summary: str, num_technical: int = 10, 
-                          num_behavioral: int = 8) -> dict:
-        """
-        Generate interview questions for the target role.
-        
-        Args:
-            target_role: Target job role
-            technical_skills: List of relevant technical skills
-            experience_summary: User's experience summary
-            num_technical: Number of technical questions to generate
-            num_behavioral: Number of behavioral questions to generate
-            
-        Returns:
-            Dictionary with questions and preparation tips
-        """
-        prompt = f"""Generate interview questions to prepare for the target job role.
+    _PROMPT_TMPL = string.Template("""Generate interview questions to prepare for the target job role.
 
-Target Role: {target_role}
-Relevant Skills: {', '.join(technical_skills)}
-Candidate Experience: {experience_summary}
+Target Role: $target_role
+Relevant Skills: $technical_skills
+Candidate Experience: $experience_summary
 
-Generate {num_technical} technical questions and {num_behavioral} behavioral questions.
+Generate $num_technical technical questions and $num_behavioral behavioral questions.
 
 Return a JSON response with the following structure:
-{{
-    "target_role": "{target_role}",
+{
+    "target_role": "$target_role",
     "technical_questions": [
-        {{
+        {
             "question": "Question text",
             "category": "category (e.g., Programming, System Design, Algorithms)",
             "difficulty": "Easy|Medium|Hard",
             "tips": "Brief tip on how to approach this question"
-        }}
+        }
     ],
     "behavioral_questions": [
-        {{
+        {
             "question": "Question text",
             "focus_area": "focus area (e.g., Leadership, Problem-solving, Teamwork)",
             "tips": "What interviewers are looking for in the answer"
-        }}
+        }
     ],
     "preparation_tips": [
         "tip1",
@@ -68,62 +46,191 @@ Return a JSON response with the following structure:
     ],
     "common_red_flags": ["red flag 1", "red flag 2"],
     "success_strategies": ["strategy1", "strategy2", "strategy3"]
-}}
+}
 
 Instructions:
-- Generate {num_technical} technical questions relevant to the role and skills
-- Generate {num_behavioral} behavioral questions (STAR method applicable)
+- Generate $num_technical technical questions relevant to the role and skills
+- Generate $num_behavioral behavioral questions (STAR method applicable)
 - Include difficulty levels for technical questions
 - Provide tips for answering each question
 - Add general preparation tips (5-7 tips)
 - List common mistakes/red flags to avoid
 - Include success strategies for interviews
 
-Return ONLY valid JSON, no additional text."""
+Return ONLY valid JSON, no additional text.""")
+    
+    _BATCH_PROMPT_TMPL = string.Template("""Generate interview questions to prepare for each of the target job roles below.
 
-        try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # Clean response text
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
+Target Roles:
+$roles_text
+Relevant Skills: $technical_skills
+Candidate Experience: $experience_summary
+
+For each role, generate $num_technical technical questions and $num_behavioral behavioral questions.
+
+Return a JSON array of length $num_roles; element i is the interview-prep object for role i, with the following structure:
+[
+    {
+        "target_role": "Role i",
+        "technical_questions": [
+            {
+                "question": "Question text",
+                "category": "category (e.g., Programming, System Design, Algorithms)",
+                "difficulty": "Easy|Medium|Hard",
+                "tips": "Brief tip on how to approach this question"
+            }
+        ],
+        "behavioral_questions": [
+            {
+                "question": "Question text",
+                "focus_area": "focus area (e.g., Leadership, Problem-solving, Teamwork)",
+                "tips": "What interviewers are looking for in the answer"
+            }
+        ],
+        "preparation_tips": ["tip1", "tip2", "tip3"],
+        "common_red_flags": ["red flag 1", "red flag 2"],
+        "success_strategies": ["strategy1", "strategy2", "strategy3"]
+    },
+    ...
+]
+
+Instructions:
+- Keep the array in the same order as the target roles
+- Generate $num_technical technical questions relevant to each role and the skills
+- Generate $num_behavioral behavioral questions per role (STAR method applicable)
+- Include difficulty levels for technical questions
+- Provide tips for answering each question
+- Add general preparation tips (5-7 tips) per role
+- List common mistakes/red flags to avoid
+- Include success strategies for interviews
+
+Return ONLY valid JSON, no additional text.""")
+    
+    def __init__(self, api_key: str = None):
+        """Initialize InterviewAgent with Google ADK."""
+        self.api_key = require_api_key(api_key)
+        
+        self.model = get_model(self.api_key)
+    
+    async def generate_questions(self, target_role: str, technical_skills: list, 
+                          experience_summary: str, num_technical: int = 10, 
+                          num_behavioral: int = 8) -> dict:
+        """
+        Generate interview questions for the target role.
+        
+        Args:
+            target_role: Target job role
+            technical_skills: List of relevant technical skills
+            experience_summary: User's experience summary
+            num_technical: Number of technical questions to generate
+            num_behavioral: Number of behavioral questions to generate
             
-            result = json.loads(response_text)
+        Returns:
+            Dictionary with questions and preparation tips
+        """
+        prompt = self._build_prompt(target_role, technical_skills, experience_summary, num_technical, num_behavioral)
+
+        try:
+            response = await generate_json(self.model, prompt, InterviewPreparation,
+                                           free_text=experience_summary)
             
             # Ensure required fields
-            result.setdefault("target_role", target_role)
-            result.setdefault("technical_questions", [])
-            result.setdefault("behavioral_questions", [])
-            result.setdefault("preparation_tips", [])
-            result.setdefault("common_red_flags", [])
-            result.setdefault("success_strategies", [])
+            return merge_defaults(response, INTERVIEW_DEFAULTS,
+                                  target_role=target_role)
             
-            return result
+        except json.JSONDecodeError as e:
+            return self._fallback(e, target_role)
+    
+    async def generate_questions_stream(self, target_role: str, technical_skills: list, 
+                                        experience_summary: str, num_technical: int = 10, 
+                                        num_behavioral: int = 8):
+        """
+        Stream interview questions, yielding each question as soon as it is generated.
+        
+        Args:
+            target_role: Target job role
+            technical_skills: List of relevant technical skills
+            experience_summary: User's experience summary
+            num_technical: Number of technical questions to generate
+            num_behavioral: Number of behavioral questions to generate
             
+        Yields:
+            {"field": "technical_questions" | "behavioral_questions", "item": question}
+            for each question as it is generated, then {"result": prep} with the full
+            response, completed with defaults exactly as generate_questions() returns it
+        """
+        prompt = self._build_prompt(target_role, technical_skills, experience_summary, num_technical, num_behavioral)
+        try:
+            async for event in stream_json_fields(self.model, prompt, ["technical_questions.item", "behavioral_questions.item"],
+                                                 InterviewPreparation, free_text=experience_summary):
+                if "result" in event:
+                    event = {"result": merge_defaults(event["result"], INTERVIEW_DEFAULTS,
+                                                      target_role=target_role)}
+                yield event
         except json.JSONDecodeError as e:
-            return {
-                "target_role": target_role,
-                "technical_questions": [],
-                "behavioral_questions": [],
-                "preparation_tips": ["Review your technical skills", "Practice the STAR method"],
-                "common_red_flags": [],
-                "success_strategies": [],
-                "error": str(e)
-            }
-        except Exception as e:
-            return {
-                "target_role": target_role,
-                "technical_questions": [],
-                "behavioral_questions": [],
-                "preparation_tips": ["Review your technical skills", "Practice the STAR method"],
-                "common_red_flags": [],
-                "success_strategies": [],
-                "error": str(e)
-            }
+            yield {"result": self._fallback(e, target_role)}
+    
+    @staticmethod
+    def _fallback(error: Exception, target_role: str) -> dict:
+        """Fallback preparation when the model response is unusable."""
+        return merge_defaults({
+            "preparation_tips": ["Review your technical skills", "Practice the STAR method"],
+            "error": str(error)
+        }, INTERVIEW_DEFAULTS, target_role=target_role)
+    
+    def _build_prompt(self, target_role: str, technical_skills: list, 
+                      experience_summary: str, num_technical: int, 
+                      num_behavioral: int) -> str:
+        """Build the interview question prompt."""
+        return self._PROMPT_TMPL.substitute(
+            target_role=target_role,
+            technical_skills=", ".join(technical_skills),
+            experience_summary=experience_summary,
+            num_technical=num_technical,
+            num_behavioral=num_behavioral
+        )
+    
+    async def generate_questions_batch(self, target_roles: list, technical_skills: list, 
+                                       experience_summary: str, num_technical: int = 10, 
+                                       num_behavioral: int = 8) -> list:
+        """
+        Generate interview questions for several roles in a single request.
+        
+        Args:
+            target_roles: List of target job roles
+            technical_skills: List of relevant technical skills
+            experience_summary: User's experience summary
+            num_technical: Number of technical questions to generate per role
+            num_behavioral: Number of behavioral questions to generate per role
+            
+        Returns:
+            List of interview-prep dictionaries, one per role in the same order;
+            roles missing from the response carry an "error" key
+        """
+        if not target_roles:
+            return []
+        
+        num_roles = len(target_roles)
+        roles_text = "\n".join(f"{i}. {role}" for i, role in enumerate(target_roles))
+        
+        prompt = self._BATCH_PROMPT_TMPL.substitute(
+            roles_text=roles_text,
+            technical_skills=", ".join(technical_skills),
+            experience_summary=experience_summary,
+            num_technical=num_technical,
+            num_behavioral=num_behavioral,
+            num_roles=num_roles
+        )
+
+        try:
+            items = batch_items(await generate_json(self.model, prompt, list[InterviewPreparation],
+                                                    free_text=experience_summary), num_roles)
+        except ValueError as e:
+            return [self._fallback(e, target_role) for target_role in target_roles]
+        
+        # Ensure required fields
+        return [
+            merge_defaults({**item, "target_role": target_role}, INTERVIEW_DEFAULTS)
+            for item, target_role in zip(items, target_roles)
+        ]
 
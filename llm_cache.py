@@ -0,0 +1,152 @@
+"""
+LLM Cache - Semantic cache for Gemini responses shared by all agents.
+Entries are keyed exactly by the structured part of a prompt (template, schema,
+roles, counts, months, ...). Within one key, the free-text part (a resume or an
+experience summary) matches exactly or, when it fits in the embedding model's
+input window, by sentence-transformer cosine similarity.
+"""
+
+from collections import OrderedDict
+from typing import Optional
+import hashlib
+import logging
+import threading
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # sentence-transformers is optional; fall back to exact matches only
+    np = None
+    SentenceTransformer = None
+
+
+log = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+SIMILARITY_THRESHOLD = 0.92
+MAX_ENTRIES = 500
+
+_lock = threading.Lock()
+_encoder_model = None  # set by the background loader once the model is ready
+_entries = OrderedDict()  # (key, text hash) -> (response text, embedding or None), by recency
+_groups = {}  # key -> {text hash: embedding} for entries that can match semantically
+
+
+def _load_encoder() -> None:
+    """Load the embedding model (runs once, in a background thread started at import)."""
+    global _encoder_model
+    try:
+        _encoder_model = SentenceTransformer(EMBEDDING_MODEL)
+    except Exception as e:
+        log.warning(f"Embedding model failed to load; LLM cache will match exactly only: {str(e)}")
+
+
+def _encoder() -> Optional[SentenceTransformer]:
+    """Return the embedding model, or None while it is still loading (never blocks)."""
+    return _encoder_model
+
+
+def _keys(prompt: str, free_text: str, schema) -> tuple:
+    """Split a prompt into an exact key for its structured part and a hash of its free text."""
+    structured = prompt.replace(free_text, "\0") if free_text else prompt
+    key = hashlib.sha256(f"{structured}\0{schema!r}".encode()).hexdigest()
+    return key, hashlib.sha256(free_text.encode()).hexdigest()
+
+
+def _embed(text: str):
+    """
+    Embed free text as a normalized float32 vector.
+
+    Returns None when semantic matching is unavailable, the model is still
+    loading, or the text would be truncated by the model (edits past the
+    cut-off would otherwise be ignored).
+    """
+    encoder = _encoder()
+    if encoder is None or not text:
+        return None
+    # Leave room for the [CLS]/[SEP] tokens the model adds
+    if len(encoder.tokenizer.tokenize(text)) > encoder.max_seq_length - 2:
+        return None
+    return np.asarray(encoder.encode(text, normalize_embeddings=True), dtype="float32")
+
+
+def lookup(prompt: str, free_text: str = "", schema=None) -> tuple:
+    """
+    Look up a cached response. Blocking (may embed text); call it off the event loop.
+
+    Args:
+        prompt: The prompt about to be sent to the model
+        free_text: The free-text part of the prompt eligible for semantic matching
+        schema: Response schema requested for the prompt
+
+    Returns:
+        (cached response text or None, embedding of free_text to pass to store())
+    """
+    try:
+        key, text_hash = _keys(prompt, free_text, schema)
+        with _lock:
+            entry = _entries.get((key, text_hash))
+            if entry is not None:
+                _entries.move_to_end((key, text_hash))
+                return entry[0], entry[1]
+
+        vector = _embed(free_text)
+        if vector is None:
+            return None, None
+        with _lock:
+            group = _groups.get(key)
+            if group:
+                hashes = list(group)
+                scores = np.stack([group[h] for h in hashes]) @ vector
+                best = int(scores.argmax())
+                if scores[best] >= SIMILARITY_THRESHOLD:
+                    _entries.move_to_end((key, hashes[best]))
+                    return _entries[(key, hashes[best])][0], vector
+        return None, vector
+    except Exception as e:
+        # The cache is an optimization; any failure is just a miss
+        log.warning(f"LLM cache lookup failed: {str(e)}")
+        return None, None
+
+
+def store(prompt: str, response: str, free_text: str = "", schema=None, vector=None) -> None:
+    """
+    Store a model response, evicting the least recently used entry when full.
+
+    Args:
+        prompt: The prompt that was sent to the model
+        response: The raw response text (only store responses that parsed)
+        free_text: The free-text part of the prompt, as passed to lookup()
+        schema: Response schema requested for the prompt
+        vector: Embedding returned by lookup(), if any
+    """
+    try:
+        key, text_hash = _keys(prompt, free_text, schema)
+        with _lock:
+            _entries[(key, text_hash)] = (response, vector)
+            _entries.move_to_end((key, text_hash))
+            if vector is not None:
+                _groups.setdefault(key, {})[text_hash] = vector
+
+            while len(_entries) > MAX_ENTRIES:
+                (evicted_key, evicted_hash), _ = _entries.popitem(last=False)
+                group = _groups.get(evicted_key)
+                if group is not None:
+                    group.pop(evicted_hash, None)
+                    if not group:
+                        del _groups[evicted_key]
+    except Exception as e:
+        log.warning(f"LLM cache store failed: {str(e)}")
+
+
+def clear() -> None:
+    """Drop all cached responses."""
+    with _lock:
+        _entries.clear()
+        _groups.clear()
+
+
+# Load the embedding model off the request path; until it is ready, lookups
+# fall back to exact matches instead of waiting for it
+if SentenceTransformer is not None:
+    threading.Thread(target=_load_encoder, daemon=True).start()
@@ -0,0 +1,41 @@
+"""
+Logging configuration - routes log records through a queue so that formatting
+and stream I/O happen on a background thread, off the request path.
+"""
+
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import logging
+import queue
+
+
+_listener = None
+
+
+def configure_logging(level: int = logging.INFO) -> QueueListener:
+    """
+    Install a QueueHandler on the root logger backed by a threaded StreamHandler.
+    
+    Safe to call more than once; later calls only update the level.
+    
+    Args:
+        level: Root logger level
+        
+    Returns:
+        The running QueueListener
+    """
+    global _listener
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _listener is not None:
+        return _listener
+    
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    
+    root.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
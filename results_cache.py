@@ -0,0 +1,85 @@
+"""
+ResultsCache - Durable SQLite cache of complete RootAgent workflow results.
+Analyses are idempotent for unchanged inputs, so a repeat run for the same
+resume, target role and roadmap length is served without any model calls.
+"""
+
+from typing import Optional
+import hashlib
+import json
+import time
+
+import aiosqlite
+
+from ._config import RESULTS_CACHE_PATH, RESULTS_CACHE_TTL
+from ._model import MODEL_NAME
+
+
+# Part of every key: bump when prompts or response schemas change, so results
+# produced by an older workflow (or another model) are never served
+CACHE_VERSION = f"1:{MODEL_NAME}"
+
+
+_CREATE_TABLE = """CREATE TABLE IF NOT EXISTS workflow_results (
+    key TEXT PRIMARY KEY,
+    results TEXT NOT NULL,
+    created_at REAL NOT NULL
+)"""
+
+
+class ResultsCache:
+    def __init__(self, path: str = None, ttl: int = RESULTS_CACHE_TTL):
+        """
+        Initialize ResultsCache.
+        
+        Args:
+            path: SQLite database file (defaults to RESULTS_CACHE_PATH, then results_cache.db)
+            ttl: Seconds a stored result stays valid
+        """
+        self.path = path or RESULTS_CACHE_PATH or "results_cache.db"
+        self.ttl = ttl
+    
+    @staticmethod
+    def make_key(resume_text: str, target_role: str = None, roadmap_months: int = 6,
+                 include_alternative_interviews: bool = False) -> str:
+        """Hash the workflow inputs into a cache key."""
+        raw = "\0".join([CACHE_VERSION, resume_text, target_role or "", str(roadmap_months),
+                         str(include_alternative_interviews)])
+        return hashlib.sha256(raw.encode()).hexdigest()
+    
+    async def get(self, key: str) -> Optional[dict]:
+        """
+        Look up stored workflow results.
+        
+        Args:
+            key: Key from make_key()
+            
+        Returns:
+            The stored results, or None if missing or expired
+        """
+        # One connection per call keeps the cache usable from any event loop
+        async with aiosqlite.connect(self.path) as db:
+            await db.execute(_CREATE_TABLE)
+            async with db.execute(
+                "SELECT results FROM workflow_results WHERE key = ? AND created_at >= ?",
+                (key, time.time() - self.ttl)
+            ) as cursor:
+                row = await cursor.fetchone()
+        return json.loads(row[0]) if row else None
+    
+    async def put(self, key: str, results_json: str) -> None:
+        """
+        Store workflow results, replacing any previous entry for the key.
+        
+        Args:
+            key: Key from make_key()
+            results_json: Results dictionary from RootAgent, already serialized
+                with json.dumps (so it can be snapshotted before a deferred write)
+        """
+        async with aiosqlite.connect(self.path) as db:
+            await db.execute(_CREATE_TABLE)
+            await db.execute(
+                "INSERT OR REPLACE INTO workflow_results (key, results, created_at) VALUES (?, ?, ?)",
+                (key, results_json, time.time())
+            )
+            await db.commit()
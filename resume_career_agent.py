@@ -0,0 +1,161 @@
+"""
+ResumeCareerAgent - Analyzes a resume and recommends career paths in one pass.
+Fuses the ResumeAgent and CareerAgent prompts into a single Gemini request.
+"""
+
+from ._config import require_api_key
+from ._model import generate_json, get_model
+from ._schemas import RESUME_DEFAULTS, ResumeCareerAnalysis, merge_defaults
+from ._streaming import stream_json_fields
+from .career_agent import MAX_ALTERNATIVE_ROLES, CareerAgent
+from .resume_agent import ResumeAgent
+import json
+import string
+
+
+class ResumeCareerAgent:
+    _PROMPT_TMPL = string.Template("""Analyze the following resume, extract key information, and based on that profile recommend the best-fit job role and alternative roles.
+
+Resume Text:
+$resume_text
+
+Return a JSON response with the following structure:
+{
+    "resume_analysis": {
+        "technical_skills": ["skill1", "skill2", ...],
+        "soft_skills": ["skill1", "skill2", ...],
+        "experience_summary": "Brief summary of experience level and years",
+        "resume_strength": 7.5,
+        "years_of_experience": 3
+    },
+    "career_recommendations": {
+        "best_fit_role": {
+            "title": "Job Title",
+            "match_score": 9.0,
+            "reasoning": "Why this role is the best fit (2-3 sentences)"
+        },
+        "alternative_roles": [
+            {
+                "title": "Alternative Job Title 1",
+                "match_score": 8.0,
+                "reasoning": "Why this is a good alternative (1-2 sentences)"
+            },
+            {
+                "title": "Alternative Job Title 2",
+                "match_score": 7.5,
+                "reasoning": "Why this is a good alternative (1-2 sentences)"
+            }
+        ],
+        "career_insights": "Additional insights about career progression and opportunities (2-3 sentences)"
+    }
+}
+
+Instructions for resume_analysis:
+- Extract all technical skills (programming languages, tools, frameworks, technologies)
+- Extract soft skills (communication, leadership, teamwork, etc.)
+- Summarize experience level in 2-3 sentences
+- Rate resume strength from 0-10 based on clarity, completeness, relevant experience, and skills
+- Estimate years of experience if mentioned
+
+Instructions for career_recommendations:
+- Recommend 1 best-fit role based on the extracted skills and experience
+- Suggest 1-2 alternative roles that are viable options
+- Provide match scores (0-10) for each role
+- Give clear reasoning for each recommendation
+- Include career insights
+
+Return ONLY valid JSON, no additional text.""")
+    
+    def __init__(self, api_key: str = None):
+        """Initialize ResumeCareerAgent with Google ADK."""
+        self.api_key = require_api_key(api_key)
+        
+        self.model = get_model(self.api_key)
+    
+    async def analyze_and_recommend(self, resume_text: str) -> dict:
+        """
+        Analyze a resume and recommend career paths with a single model call.
+        
+        Args:
+            resume_text: The resume content as text
+            
+        Returns:
+            Dictionary with "resume_analysis" and "career_recommendations", shaped
+            like the ResumeAgent.analyze and CareerAgent.recommend_careers results
+            
+        Raises:
+            ValueError: If the response lacks either section or a best-fit role
+        """
+        prompt = self._build_prompt(resume_text)
+
+        try:
+            result = await generate_json(self.model, prompt, ResumeCareerAnalysis, free_text=resume_text)
+            return self._complete(result)
+            
+        except json.JSONDecodeError as e:
+            return self._fallback(e)
+    
+    async def analyze_and_recommend_stream(self, resume_text: str):
+        """
+        Stream the fused analysis, yielding skills and roles as soon as they are generated.
+        
+        Args:
+            resume_text: The resume content as text
+            
+        Yields:
+            {"field": "resume_analysis.technical_skills" | "resume_analysis.soft_skills"
+            | "career_recommendations.best_fit_role" | "career_recommendations.alternative_roles",
+            "item": value} as each is generated (at most MAX_ALTERNATIVE_ROLES alternatives),
+            then {"result": analysis} completed exactly as analyze_and_recommend() returns it
+            
+        Raises:
+            ValueError: If the response lacks either section or a best-fit role
+        """
+        prompt = self._build_prompt(resume_text)
+        paths = ["resume_analysis.technical_skills.item", "resume_analysis.soft_skills.item",
+                 "career_recommendations.best_fit_role", "career_recommendations.alternative_roles.item"]
+        alternatives = 0
+        try:
+            async for event in stream_json_fields(self.model, prompt, paths,
+                                                 ResumeCareerAnalysis, free_text=resume_text):
+                if "result" in event:
+                    event = {"result": self._complete(event["result"])}
+                elif event["field"] == "career_recommendations.alternative_roles":
+                    # Do not show roles that the final result will drop
+                    alternatives += 1
+                    if alternatives > MAX_ALTERNATIVE_ROLES:
+                        continue
+                yield event
+        except json.JSONDecodeError as e:
+            yield {"result": self._fallback(e)}
+    
+    @staticmethod
+    def _complete(result) -> dict:
+        """Validate the fused response and complete each section like its single agent."""
+        # Both sections must be present; filling a missing one with defaults would
+        # drive the later steps with placeholder data (e.g. role "Not specified")
+        if not isinstance(result, dict):
+            raise ValueError("Expected a JSON object with resume_analysis and career_recommendations")
+        for section in ("resume_analysis", "career_recommendations"):
+            if not isinstance(result.get(section), dict) or not result[section]:
+                raise ValueError(f"Model response is missing {section}")
+        best_fit_role = result["career_recommendations"].get("best_fit_role")
+        if not isinstance(best_fit_role, dict) or not best_fit_role.get("title"):
+            raise ValueError("Model response is missing best_fit_role")
+        
+        return {
+            "resume_analysis": merge_defaults(result["resume_analysis"], RESUME_DEFAULTS),
+            "career_recommendations": CareerAgent._complete(result["career_recommendations"])
+        }
+    
+    @staticmethod
+    def _fallback(error: Exception) -> dict:
+        """Fallback sections when the model response is malformed JSON."""
+        return {
+            "resume_analysis": ResumeAgent._fallback(error),
+            "career_recommendations": CareerAgent._fallback(error)
+        }
+    
+    def _build_prompt(self, resume_text: str) -> str:
+        """Build the fused resume analysis and career recommendation prompt."""
+        return self._PROMPT_TMPL.substitute(resume_text=resume_text)
@@ -3,74 +3,61 @@ RoadmapAgent - Creates structured learning roadmaps for skill development.
 Uses Google ADK for personalized learning path generation.
 """
 
-from google import generativeai as genai
+from ._config import require_api_key
+from ._model import generate_json, get_model
+from ._schemas import ROADMAP_DEFAULTS, LearningRoadmap, merge_defaults
+from ._streaming import stream_json_fields
+from ._utils import batch_items
 import json
-import os
+import string
+
+
+# Compact month keys requested from the model -> full response keys
+_MONTH_KEYS = {
+    "m": "month",
+    "f": "focus_areas",
+    "o": "learning_objectives",
+    "s": "skills_to_acquire",
+    "p": "practice_projects",
+    "r": "resources"
+}
+
+
+def _expand_month(month: dict) -> dict:
+    """Rename a monthly goal's compact keys to the full response keys."""
+    return {_MONTH_KEYS.get(key, key): value for key, value in month.items()}
+
+
+def _expand_roadmap(result: dict) -> dict:
+    """Expand the compact keys of every monthly goal in a parsed roadmap."""
+    if isinstance(result, dict) and isinstance(result.get("monthly_goals"), list):
+        result["monthly_goals"] = [_expand_month(month) if isinstance(month, dict) else month
+                                   for month in result["monthly_goals"]]
+    return result
 
 
 class RoadmapAgent:
-    def __init__(self, api_key: str = None):
-        """Initialize RoadmapAgent with Google ADK."""
-        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
-        if not self.api_key:
-            raise ValueError("Google API key is required. Set GOOGLE_API_KEY environment variable.")
-        
-        genai.configure(api_key=self.api_key)
-        # Using gemini-2.0-flash for better performance and speed
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
-    
-    def create_roadmap(self, target_role: str, missing_skills: list, 
-                      current_skills: list, months: int = 6) -> dict:
-        """
-        Create a structured learning roadmap.
-        
-        Args:
-            target_role: Target job role
-            missing_skills: List of skills to learn (can include priority info)
-            current_skills: User's current skills
-            months: Duration of roadmap (3-6 months)
-            
-        Returns:
-            Dictionary with structured roadmap
-        """
-        # Prepare skills list with priorities if available
-        skills_text = ""
-        if isinstance(missing_skills, list) and len(missing_skills) > 0:
-            if isinstance(missing_skills[0], dict):
-                skills_text = ", ".join([f"{s.get('skill', '')} ({s.get('priority', 'Medium')})" 
-                                        for s in missing_skills])
-            else:
-                skills_text = ", ".join(missing_skills)
-        else:
-            skills_text = "No specific skills provided"
-        
-        prompt = f"""Create a structured {months}-month learning roadmap to prepare for the target job role.
+    _PROMPT_TMPL = string.Template("""Create a structured $months-month learning roadmap to prepare for the target job role.
 
-Target Role: {target_role}
-Skills to Learn: {skills_text}
-Current Skills: {', '.join(current_skills)}
+Target Role: $target_role
+Skills to Learn: $skills_text
+Current Skills: $current_skills
 
 Return a JSON response with the following structure:
-{{
-    "roadmap_duration": {months},
-    "target_role": "{target_role}",
+{
+    "roadmap_duration": $months,
+    "target_role": "$target_role",
     "monthly_goals": [
-        {{
-            "month": 1,
-            "focus_areas": ["area1", "area2", "area3"],
-            "learning_objectives": ["objective1", "objective2"],
-            "skills_to_acquire": ["skill1", "skill2"],
-            "practice_projects": ["project1", "project2"],
-            "resources": ["resource1", "resource2"]
-        }},
+        {"m": 1, "f": ["area1", "area2", "area3"], "o": ["objective1", "objective2"], "s": ["skill1", "skill2"], "p": ["project1", "project2"], "r": ["resource1", "resource2"]},
         ...
     ],
     "overall_strategy": "High-level learning strategy for the entire roadmap (2-3 sentences)",
     "success_metrics": ["metric1", "metric2", "metric3"]
-}}
+}
 
 Instructions:
-- Break down the roadmap into monthly goals (for {months} months)
+- Break down the roadmap into monthly goals (for $months months)
+- Use the compact keys for each month: m = month number, f = focus areas, o = learning objectives, s = skills to acquire, p = practice projects, r = resources
 - Each month should have 2-4 focus areas
 - Include specific learning objectives for each month
 - List skills to acquire each month
@@ -79,48 +66,170 @@ Instructions:
 - Provide an overall learning strategy
 - Include success metrics to track progress
 
-Return ONLY valid JSON, no additional text."""
+Return ONLY valid JSON, no additional text.""")
+    
+    _BATCH_PROMPT_TMPL = string.Template("""Create a structured learning roadmap for each of the targets below.
 
-        try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # Clean response text
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
+Targets:
+$targets_text
+
+Return a JSON array of length $num_targets; element i is the roadmap object for target i, with the following structure:
+[
+    {
+        "roadmap_duration": 6,
+        "target_role": "Role i",
+        "monthly_goals": [
+            {"m": 1, "f": ["area1", "area2", "area3"], "o": ["objective1", "objective2"], "s": ["skill1", "skill2"], "p": ["project1", "project2"], "r": ["resource1", "resource2"]},
+            ...
+        ],
+        "overall_strategy": "High-level learning strategy for the entire roadmap (2-3 sentences)",
+        "success_metrics": ["metric1", "metric2", "metric3"]
+    },
+    ...
+]
+
+Instructions:
+- Keep the array in the same order as the targets
+- Break down each roadmap into monthly goals for that target's duration
+- Use the compact keys for each month: m = month number, f = focus areas, o = learning objectives, s = skills to acquire, p = practice projects, r = resources
+- Each month should have 2-4 focus areas
+- Include specific learning objectives for each month
+- List skills to acquire each month
+- Suggest 1-2 practice projects per month (real-world applicable)
+- Recommend learning resources (courses, books, tutorials)
+- Provide an overall learning strategy
+- Include success metrics to track progress
+
+Return ONLY valid JSON, no additional text.""")
+    
+    def __init__(self, api_key: str = None):
+        """Initialize RoadmapAgent with Google ADK."""
+        self.api_key = require_api_key(api_key)
+        
+        self.model = get_model(self.api_key)
+    
+    async def create_roadmap(self, target_role: str, missing_skills: list, 
+                      current_skills: list, months: int = 6) -> dict:
+        """
+        Create a structured learning roadmap.
+        
+        Args:
+            target_role: Target job role
+            missing_skills: List of skills to learn (can include priority info)
+            current_skills: User's current skills
+            months: Duration of roadmap (3-6 months)
             
-            result = json.loads(response_text)
+        Returns:
+            Dictionary with structured roadmap
+        """
+        prompt = self._build_prompt(target_role, missing_skills, current_skills, months)
+
+        try:
+            response = await generate_json(self.model, prompt, LearningRoadmap)
             
             # Ensure required fields
-            result.setdefault("roadmap_duration", months)
-            result.setdefault("target_role", target_role)
-            result.setdefault("monthly_goals", [])
-            result.setdefault("overall_strategy", "No strategy provided")
-            result.setdefault("success_metrics", [])
+            return merge_defaults(_expand_roadmap(response), ROADMAP_DEFAULTS,
+                                  roadmap_duration=months, target_role=target_role)
             
-            return result
+        except json.JSONDecodeError as e:
+            return self._fallback(e, target_role, months)
+    
+    async def create_roadmap_stream(self, target_role: str, missing_skills: list, 
+                                    current_skills: list, months: int = 6):
+        """
+        Stream a learning roadmap, yielding each month as soon as it is generated.
+        
+        Args:
+            target_role: Target job role
+            missing_skills: List of skills to learn (can include priority info)
+            current_skills: User's current skills
+            months: Duration of roadmap (3-6 months)
             
+        Yields:
+            {"field": "monthly_goals", "item": month} for each monthly goal as it
+            is generated, then {"result": roadmap} with the full response,
+            completed with defaults exactly as create_roadmap() returns it
+        """
+        prompt = self._build_prompt(target_role, missing_skills, current_skills, months)
+        try:
+            async for event in stream_json_fields(self.model, prompt, ["monthly_goals.item"],
+                                                 LearningRoadmap):
+                if "result" in event:
+                    yield {"result": merge_defaults(_expand_roadmap(event["result"]), ROADMAP_DEFAULTS,
+                                                    roadmap_duration=months, target_role=target_role)}
+                else:
+                    yield {"field": event["field"], "item": _expand_month(event["item"])}
         except json.JSONDecodeError as e:
-            return {
-                "roadmap_duration": months,
-                "target_role": target_role,
-                "monthly_goals": [],
-                "overall_strategy": "Error creating roadmap",
-                "success_metrics": [],
-                "error": str(e)
-            }
-        except Exception as e:
-            return {
-                "roadmap_duration": months,
-                "target_role": target_role,
-                "monthly_goals": [],
-                "overall_strategy": f"Error: {str(e)}",
-                "success_metrics": [],
-                "error": str(e)
-            }
+            yield {"result": self._fallback(e, target_role, months)}
+    
+    @staticmethod
+    def _fallback(error: Exception, target_role: str, months: int) -> dict:
+        """Fallback roadmap when the model response is unusable."""
+        return merge_defaults({
+            "overall_strategy": "Error creating roadmap",
+            "error": str(error)
+        }, ROADMAP_DEFAULTS, roadmap_duration=months, target_role=target_role)
+    
+    def _build_prompt(self, target_role: str, missing_skills: list, 
+                      current_skills: list, months: int) -> str:
+        """Build the learning roadmap prompt."""
+        # Prepare skills list with priorities if available
+        skills_text = self._format_skills(missing_skills)
+        
+        return self._PROMPT_TMPL.substitute(
+            months=months,
+            target_role=target_role,
+            skills_text=skills_text,
+            current_skills=", ".join(current_skills)
+        )
+    
+    async def create_roadmap_batch(self, targets: list) -> list:
+        """
+        Create learning roadmaps for several targets in a single request.
+        
+        Args:
+            targets: List of dictionaries, each with "target_role", "missing_skills",
+                "current_skills" and optional "months" (same meaning as create_roadmap)
+            
+        Returns:
+            List of roadmap dictionaries, one per target in the same order;
+            targets missing from the response carry an "error" key
+        """
+        if not targets:
+            return []
+        
+        num_targets = len(targets)
+        targets_text = "\n".join(
+            f"{i}. Target Role: {t['target_role']} | Duration: {t.get('months', 6)} months | "
+            f"Skills to Learn: {self._format_skills(t.get('missing_skills', []))} | "
+            f"Current Skills: {', '.join(t.get('current_skills', []))}"
+            for i, t in enumerate(targets)
+        )
+        
+        prompt = self._BATCH_PROMPT_TMPL.substitute(
+            targets_text=targets_text,
+            num_targets=num_targets
+        )
+
+        try:
+            items = batch_items(await generate_json(self.model, prompt, list[LearningRoadmap]), num_targets)
+        except ValueError as e:
+            return [self._fallback(e, t["target_role"], t.get("months", 6)) for t in targets]
+        
+        # Ensure required fields
+        return [
+            merge_defaults({**_expand_roadmap(item), "target_role": t["target_role"]}, ROADMAP_DEFAULTS,
+                           roadmap_duration=t.get("months", 6))
+            for item, t in zip(items, targets)
+        ]
+    
+    @staticmethod
+    def _format_skills(missing_skills: list) -> str:
+        """Render missing skills (with priorities if available) for a prompt."""
+        if isinstance(missing_skills, list) and len(missing_skills) > 0:
+            if isinstance(missing_skills[0], dict):
+                return ", ".join([f"{s.get('skill', '')} ({s.get('priority', 'Medium')})" 
+                                  for s in missing_skills])
+            return ", ".join(missing_skills)
+        return "No specific skills provided"
 
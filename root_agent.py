@@ -1,14 +1,57 @@
 """
-Root Agent - Orchestrates all specialized agents in sequential order.
+Root Agent - Orchestrates all specialized agents, overlapping independent steps.
 Passes context between agents and returns unified structured response.
 """
 
-from .resume_agent import ResumeAgent
+from ._config import RESULTS_CACHE_PATH, require_api_key
+from ._model import run_sync
+from .analysis_result import AnalysisResult
+from .resume_career_agent import ResumeCareerAgent
+from .results_cache import ResultsCache
 from .skill_gap_agent import SkillGapAgent
-from .career_agent import CareerAgent
 from .roadmap_agent import RoadmapAgent
 from .interview_agent import InterviewAgent
-import os
+from google.api_core.exceptions import GoogleAPIError
+import asyncio
+import json
+import logging
+import sqlite3
+
+
+log = logging.getLogger(__name__)
+
+# Expected failures of a workflow step: API errors (after retries) and unusable
+# model output (ValueError also covers json.JSONDecodeError and blocked responses)
+_WORKFLOW_ERRORS = (GoogleAPIError, ValueError)
+
+
+def _normalize_skills(skills: list) -> list:
+    """
+    Strip and de-duplicate skills case-insensitively, keeping the first spelling seen.
+    
+    Smaller, canonical skill lists keep downstream prompts short and improve cache hits.
+    """
+    unique = {}
+    for skill in skills:
+        if isinstance(skill, str) and skill.strip():
+            unique.setdefault(skill.strip().casefold(), skill.strip())
+    return list(unique.values())
+
+
+def _is_complete(results: dict) -> bool:
+    """
+    Check whether every step produced real output, i.e. results are safe to cache.
+    
+    Agents turn malformed model output into fallback sections marked with an
+    "error" key rather than raising, so those must be checked as well as errors.
+    """
+    if results["errors"]:
+        return False
+    sections = [results[name] for name in ("resume_analysis", "career_recommendations",
+                                           "skill_gap_analysis", "learning_roadmap",
+                                           "interview_preparation")]
+    sections.extend(results["alternative_interview_preparation"])
+    return all(isinstance(section, dict) and "error" not in section for section in sections)
 
 
 class RootAgent:
@@ -16,38 +59,119 @@ class RootAgent:
     Root Agent that orchestrates the entire career mentoring workflow.
     
     Execution flow:
-    1. ResumeAgent - Extract skills and experience from resume
-    2. CareerAgent - Recommend best-fit role based on profile
+    1-2. ResumeCareerAgent - Extract skills and experience from resume and
+         recommend best-fit role based on profile (single model call)
     3. SkillGapAgent - Identify gaps for the recommended role
     4. RoadmapAgent - Create learning roadmap to fill gaps
-    5. InterviewAgent - Generate interview questions for the role
+    5. InterviewAgent - Generate interview questions for the role (and, on
+       request, for the alternative roles)
+    
+    Steps 3-4 and Step 5 run concurrently once the target role is known.
+    When a ResultsCache is in use, complete results are stored and reused for
+    identical inputs.
     """
     
-    def __init__(self, api_key: str = None):
-        """Initialize RootAgent and all sub-agents."""
-        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
-        if not self.api_key:
-            raise ValueError("Google API key is required. Set GOOGLE_API_KEY environment variable.")
+    def __init__(self, api_key: str = None, results_cache=None):
+        """
+        Initialize RootAgent and all sub-agents.
+        
+        Args:
+            api_key: Google API key (defaults to GOOGLE_API_KEY)
+            results_cache: ResultsCache to use, or False to disable caching. By
+                default a cache is used only if RESULTS_CACHE_PATH is set.
+        """
+        self.api_key = require_api_key(api_key)
+        if results_cache is None and RESULTS_CACHE_PATH:
+            results_cache = ResultsCache()
+        self.results_cache = results_cache or None
+        self._pending_writes = set()
         
         # Initialize all specialized agents
-        self.resume_agent = ResumeAgent(self.api_key)
+        self.resume_career_agent = ResumeCareerAgent(self.api_key)
         self.skill_gap_agent = SkillGapAgent(self.api_key)
-        self.career_agent = CareerAgent(self.api_key)
         self.roadmap_agent = RoadmapAgent(self.api_key)
         self.interview_agent = InterviewAgent(self.api_key)
     
-    def analyze(self, resume_text: str, target_role: str = None, roadmap_months: int = 6) -> dict:
+    def analyze(self, resume_text: str, target_role: str = None, roadmap_months: int = 6,
+                include_alternative_interviews: bool = False) -> dict:
+        """
+        Execute the complete career mentoring workflow (synchronous wrapper).
+        
+        Runs on a shared background event loop and waits for the results-cache
+        write before returning (that loop's thread dies with the process).
+        Async callers (e.g. FastAPI handlers) must await analyze_async()
+        instead; calling this from a running event loop raises RuntimeError.
+        
+        Args:
+            resume_text: The resume content as text
+            target_role: Optional target role. If not provided, ResumeCareerAgent will recommend one.
+            roadmap_months: Duration for learning roadmap (3-6 months)
+            include_alternative_interviews: Also prepare interview questions for
+                the alternative roles
+            
+        Returns:
+            Unified structured response with all analysis results
+        """
+        async def analyze_and_flush():
+            results = await self.analyze_async(resume_text, target_role, roadmap_months,
+                                               include_alternative_interviews)
+            await self.flush_cache_writes()
+            return results
+        
+        return run_sync(analyze_and_flush())
+    
+    async def analyze_many(self, resumes: list, target_role: str = None, roadmap_months: int = 6,
+                           include_alternative_interviews: bool = False) -> list:
+        """
+        Execute the workflow for several resumes concurrently.
+        
+        Gemini requests across all workflows are bounded by GENAI_MAX_INFLIGHT.
+        
+        Args:
+            resumes: List of resume texts
+            target_role: Optional target role applied to every resume
+            roadmap_months: Duration for learning roadmap (3-6 months)
+            include_alternative_interviews: Also prepare interview questions for
+                the alternative roles
+            
+        Returns:
+            List of unified results, one per resume in the same order
+        """
+        return await asyncio.gather(*[
+            self.analyze_async(resume_text, target_role, roadmap_months, include_alternative_interviews)
+            for resume_text in resumes
+        ])
+    
+    async def analyze_async(self, resume_text: str, target_role: str = None, roadmap_months: int = 6,
+                            include_alternative_interviews: bool = False) -> dict:
         """
         Execute the complete career mentoring workflow.
         
+        Steps 1-2 share one model call; once the target role is known, the
+        skill gap -> roadmap chain runs concurrently with interview preparation.
+        
         Args:
             resume_text: The resume content as text
-            target_role: Optional target role. If not provided, CareerAgent will recommend one.
+            target_role: Optional target role. If not provided, ResumeCareerAgent will recommend one.
             roadmap_months: Duration for learning roadmap (3-6 months)
+            include_alternative_interviews: Also prepare interview questions for
+                the alternative roles (one extra request for all of them)
             
         Returns:
             Unified structured response with all analysis results
         """
+        cache_key = ResultsCache.make_key(resume_text, target_role, roadmap_months,
+                                          include_alternative_interviews)
+        if self.results_cache is not None:
+            try:
+                cached = await self.results_cache.get(cache_key)
+            except sqlite3.Error as e:
+                log.warning(f"Results cache lookup failed: {str(e)}")
+                cached = None
+            if cached is not None:
+                log.info("Returning cached analysis results")
+                return cached
+        
         context = {
             "resume_text": resume_text,
             "target_role": target_role,
@@ -60,102 +184,127 @@ class RootAgent:
             "skill_gap_analysis": None,
             "learning_roadmap": None,
             "interview_preparation": None,
+            "alternative_interview_preparation": [],
             "errors": []
         }
         
         try:
-            # Step 1: Analyze Resume
-            print("Step 1: Analyzing resume...")
-            resume_analysis = self.resume_agent.analyze(resume_text)
+            # Steps 1-2: Analyze Resume and generate Career Recommendations in one call
+            log.info("Steps 1-2: Analyzing resume and generating career recommendations...")
+            first_pass = await self.resume_career_agent.analyze_and_recommend(resume_text)
+            resume_analysis = first_pass["resume_analysis"]
+            career_recommendations = first_pass["career_recommendations"]
             results["resume_analysis"] = resume_analysis
+            results["career_recommendations"] = career_recommendations
             context.update({
-                "technical_skills": resume_analysis.get("technical_skills", []),
-                "soft_skills": resume_analysis.get("soft_skills", []),
+                "technical_skills": _normalize_skills(resume_analysis.get("technical_skills", [])),
+                "soft_skills": _normalize_skills(resume_analysis.get("soft_skills", [])),
                 "experience_summary": resume_analysis.get("experience_summary", ""),
                 "years_of_experience": resume_analysis.get("years_of_experience", 0)
             })
             
-            # Step 2: Career Recommendations
-            print("Step 2: Generating career recommendations...")
-            career_recommendations = self.career_agent.recommend_careers(
-                technical_skills=context["technical_skills"],
-                soft_skills=context["soft_skills"],
-                experience_summary=context["experience_summary"],
-                years_of_experience=context["years_of_experience"]
-            )
-            results["career_recommendations"] = career_recommendations
-            
             # Determine target role for subsequent steps
             if not target_role:
                 target_role = career_recommendations.get("best_fit_role", {}).get("title", "Software Engineer")
             context["target_role"] = target_role
             
-            # Step 3: Skill Gap Analysis
-            print("Step 3: Analyzing skill gaps...")
-            all_skills = context["technical_skills"] + context["soft_skills"]
-            skill_gap_analysis = self.skill_gap_agent.analyze_gaps(
-                user_skills=all_skills,
-                target_role=target_role,
-                experience_summary=context["experience_summary"]
-            )
-            results["skill_gap_analysis"] = skill_gap_analysis
-            context["missing_skills"] = skill_gap_analysis.get("missing_skills", [])
+            all_skills = _normalize_skills(context["technical_skills"] + context["soft_skills"])
+            
+            async def gaps_and_roadmap():
+                # Step 3: Skill Gap Analysis
+                log.info("Step 3: Analyzing skill gaps...")
+                skill_gap_analysis = await self.skill_gap_agent.analyze_gaps(
+                    user_skills=all_skills,
+                    target_role=target_role,
+                    experience_summary=context["experience_summary"]
+                )
+                results["skill_gap_analysis"] = skill_gap_analysis
+                context["missing_skills"] = skill_gap_analysis.get("missing_skills", [])
+                
+                # Step 4: Learning Roadmap (depends on the missing skills from Step 3)
+                log.info("Step 4: Creating learning roadmap...")
+                results["learning_roadmap"] = await self.roadmap_agent.create_roadmap(
+                    target_role=target_role,
+                    missing_skills=context["missing_skills"],
+                    current_skills=all_skills,
+                    months=roadmap_months
+                )
+            
+            async def interview_prep():
+                # Step 5: Interview Preparation (independent of Steps 3-4)
+                log.info("Step 5: Generating interview questions...")
+                results["interview_preparation"] = await self.interview_agent.generate_questions(
+                    target_role=target_role,
+                    technical_skills=context["technical_skills"],
+                    experience_summary=context["experience_summary"]
+                )
             
-            # Step 4: Learning Roadmap
-            print("Step 4: Creating learning roadmap...")
-            learning_roadmap = self.roadmap_agent.create_roadmap(
-                target_role=target_role,
-                missing_skills=context["missing_skills"],
-                current_skills=all_skills,
-                months=roadmap_months
-            )
-            results["learning_roadmap"] = learning_roadmap
+            async def alternative_interview_prep():
+                # Optional: one batched request covering all alternative roles
+                alternative_titles = [
+                    role.get("title") for role in career_recommendations.get("alternative_roles", [])
+                    if role.get("title") and role.get("title") != target_role
+                ]
+                log.info("Step 5b: Generating interview questions for alternative roles...")
+                results["alternative_interview_preparation"] = await self.interview_agent.generate_questions_batch(
+                    target_roles=alternative_titles,
+                    technical_skills=context["technical_skills"],
+                    experience_summary=context["experience_summary"]
+                )
             
-            # Step 5: Interview Preparation
-            print("Step 5: Generating interview questions...")
-            interview_preparation = self.interview_agent.generate_questions(
-                target_role=target_role,
-                technical_skills=context["technical_skills"],
-                experience_summary=context["experience_summary"]
-            )
-            results["interview_preparation"] = interview_preparation
+            branches = [gaps_and_roadmap(), interview_prep()]
+            if include_alternative_interviews:
+                branches.append(alternative_interview_prep())
             
-            print("Analysis complete!")
+            # Agents raise on API errors; record a failing branch without discarding the others
+            outcomes = await asyncio.gather(*branches, return_exceptions=True)
+            for outcome in outcomes:
+                if isinstance(outcome, _WORKFLOW_ERRORS):
+                    error_msg = f"Error in workflow execution: {str(outcome)}"
+                    log.error(error_msg)
+                    results["errors"].append(error_msg)
+                elif isinstance(outcome, BaseException):
+                    raise outcome
             
-        except Exception as e:
+            log.info("Analysis complete!")
+            
+        except _WORKFLOW_ERRORS as e:
             error_msg = f"Error in workflow execution: {str(e)}"
-            print(error_msg)
+            log.error(error_msg)
             results["errors"].append(error_msg)
         
+        # Only complete runs are cached; write behind so the response is not delayed.
+        # Serialize now: the caller owns (and may mutate) results once we return.
+        if self.results_cache is not None and _is_complete(results):
+            task = asyncio.create_task(self._write_results(cache_key, json.dumps(results)))
+            self._pending_writes.add(task)
+            task.add_done_callback(self._pending_writes.discard)
+        
         return results
     
-    def get_summary(self, results: dict) -> dict:
+    async def _write_results(self, cache_key: str, results_json: str) -> None:
+        """Store serialized workflow results in the results cache, logging (not raising) failures."""
+        try:
+            await self.results_cache.put(cache_key, results_json)
+        except sqlite3.Error as e:
+            log.warning(f"Results cache write failed: {str(e)}")
+    
+    async def flush_cache_writes(self) -> None:
+        """Wait for pending write-behind results-cache writes to finish."""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes)
+    
+    def get_summary(self, results) -> dict:
         """
         Generate a high-level summary of the analysis results.
         
         Args:
-            results: Results dictionary from analyze() method
+            results: Results dictionary from analyze() method, or an AnalysisResult
+                wrapping it (whose summary is computed only once)
             
         Returns:
             Summary dictionary
         """
-        resume = results.get("resume_analysis", {})
-        career = results.get("career_recommendations", {})
-        gaps = results.get("skill_gap_analysis", {})
-        roadmap = results.get("learning_roadmap", {})
-        interview = results.get("interview_preparation", {})
-        
-        best_fit = career.get("best_fit_role", {})
-        
-        return {
-            "resume_strength": resume.get("resume_strength", 0.0),
-            "recommended_role": best_fit.get("title", "Not determined"),
-            "readiness_score": gaps.get("readiness_score", 0.0),
-            "total_skill_gaps": len(gaps.get("missing_skills", [])),
-            "roadmap_duration": roadmap.get("roadmap_duration", 0),
-            "interview_questions_generated": {
-                "technical": len(interview.get("technical_questions", [])),
-                "behavioral": len(interview.get("behavioral_questions", []))
-            }
-        }
-
+        if not isinstance(results, AnalysisResult):
+            results = AnalysisResult(results)
+        return results.summary
@@ -3,52 +3,33 @@ SkillGapAgent - Compares user skills with target job role and identifies gaps.
 Uses Google ADK for intelligent skill gap analysis.
 """
 
-from google import generativeai as genai
+from ._config import require_api_key
+from ._model import generate_json, get_model
+from ._schemas import SKILL_GAP_DEFAULTS, SkillGapAnalysis, merge_defaults
+from ._streaming import stream_json_fields
 import json
-import os
+import string
 
 
 class SkillGapAgent:
-    def __init__(self, api_key: str = None):
-        """Initialize SkillGapAgent with Google ADK."""
-        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
-        if not self.api_key:
-            raise ValueError("Google API key is required. Set GOOGLE_API_KEY environment variable.")
-        
-        genai.configure(api_key=self.api_key)
-        # Using gemini-2.0-flash for better performance and speed
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
-    
-    def analyze_gaps(self, user_skills: list, target_role: str, experience_summary: str = "") -> dict:
-        """
-        Analyze skill gaps between user skills and target role requirements.
-        
-        Args:
-            user_skills: List of user's technical and soft skills
-            target_role: Target job role (e.g., "Senior Software Engineer", "Data Scientist")
-            experience_summary: Optional summary of user's experience
-            
-        Returns:
-            Dictionary with missing skills and priorities
-        """
-        prompt = f"""Analyze skill gaps between the user's skills and the requirements for the target job role.
+    _PROMPT_TMPL = string.Template("""Analyze skill gaps between the user's skills and the requirements for the target job role.
 
-User's Skills: {', '.join(user_skills)}
-Target Job Role: {target_role}
-User's Experience: {experience_summary}
+User's Skills: $user_skills
+Target Job Role: $target_role
+User's Experience: $experience_summary
 
 Return a JSON response with the following structure:
-{{
+{
     "missing_skills": [
-        {{
+        {
             "skill": "skill name",
             "priority": "High|Medium|Low",
             "reason": "Why this skill is important for the role"
-        }}
+        }
     ],
     "gap_analysis": "Overall summary of skill gaps in 2-3 sentences",
     "readiness_score": 7.5
-}}
+}
 
 Instructions:
 - Identify missing skills required for the target role
@@ -57,42 +38,75 @@ Instructions:
 - Calculate a readiness score (0-10) based on how well the user's skills match the role
 - Write a brief gap analysis summary
 
-Return ONLY valid JSON, no additional text."""
+Return ONLY valid JSON, no additional text.""")
+    
+    def __init__(self, api_key: str = None):
+        """Initialize SkillGapAgent with Google ADK."""
+        self.api_key = require_api_key(api_key)
+        
+        self.model = get_model(self.api_key)
+    
+    async def analyze_gaps(self, user_skills: list, target_role: str, experience_summary: str = "") -> dict:
+        """
+        Analyze skill gaps between user skills and target role requirements.
+        
+        Args:
+            user_skills: List of user's technical and soft skills
+            target_role: Target job role (e.g., "Senior Software Engineer", "Data Scientist")
+            experience_summary: Optional summary of user's experience
+            
+        Returns:
+            Dictionary with missing skills and priorities
+        """
+        prompt = self._build_prompt(user_skills, target_role, experience_summary)
 
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # Clean response text
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-            
-            result = json.loads(response_text)
+            response = await generate_json(self.model, prompt, SkillGapAnalysis,
+                                           free_text=experience_summary)
             
             # Ensure required fields
-            result.setdefault("missing_skills", [])
-            result.setdefault("gap_analysis", "No gaps identified")
-            result.setdefault("readiness_score", 0.0)
+            return merge_defaults(response, SKILL_GAP_DEFAULTS)
             
-            return result
+        except json.JSONDecodeError as e:
+            return self._fallback(e)
+    
+    async def analyze_gaps_stream(self, user_skills: list, target_role: str, experience_summary: str = ""):
+        """
+        Stream skill gap analysis, yielding each missing skill as soon as it is generated.
+        
+        Args:
+            user_skills: List of user's technical and soft skills
+            target_role: Target job role
+            experience_summary: Optional summary of user's experience
             
+        Yields:
+            {"field": "missing_skills", "item": gap} for each missing skill as it
+            is generated, then {"result": analysis} with the full response,
+            completed with defaults exactly as analyze_gaps() returns it
+        """
+        prompt = self._build_prompt(user_skills, target_role, experience_summary)
+        try:
+            async for event in stream_json_fields(self.model, prompt, ["missing_skills.item"],
+                                                 SkillGapAnalysis, free_text=experience_summary):
+                if "result" in event:
+                    event = {"result": merge_defaults(event["result"], SKILL_GAP_DEFAULTS)}
+                yield event
         except json.JSONDecodeError as e:
-            return {
-                "missing_skills": [],
-                "gap_analysis": "Error analyzing skill gaps",
-                "readiness_score": 0.0,
-                "error": str(e)
-            }
-        except Exception as e:
-            return {
-                "missing_skills": [],
-                "gap_analysis": f"Error: {str(e)}",
-                "readiness_score": 0.0,
-                "error": str(e)
-            }
+            yield {"result": self._fallback(e)}
+    
+    @staticmethod
+    def _fallback(error: Exception) -> dict:
+        """Fallback analysis when the model response is malformed JSON."""
+        return merge_defaults({
+            "gap_analysis": "Error analyzing skill gaps",
+            "error": str(error)
+        }, SKILL_GAP_DEFAULTS)
+    
+    def _build_prompt(self, user_skills: list, target_role: str, experience_summary: str) -> str:
+        """Build the skill gap analysis prompt."""
+        return self._PROMPT_TMPL.substitute(
+            user_skills=", ".join(user_skills),
+            target_role=target_role,
+            experience_summary=experience_summary
+        )
 